@@ -1,74 +1,210 @@
 #!/usr/bin/env python3
 
 import click
+import functools
 import psutil
-import yaml
 import os
+import re
+import select
 import sys
 import json
 from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
 import subprocess
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Pattern, Tuple
 from pathlib import Path
 import signal
-import requests
+import threading
 import time
-from server_registry import ServerRegistry
+from concurrent.futures import ThreadPoolExecutor
+from server_registry import ServerRegistry, find_npm_path, load_json_cached, write_json_atomic
 
 console = Console()
 
+# How long a process scan is reused before /proc is walked again
+DETECT_CACHE_TTL = 0.5
+
+# How long stopped servers get to exit after SIGTERM before they are killed
+STOP_GRACE_PERIOD = 3.0
+
+# Cap on concurrent server launches in start_all
+MAX_PARALLEL_STARTS = 16
+
+# Upper bound on how long a freshly started server is watched before it counts as up
+SERVER_READY_TIMEOUT = 2.0
+
+# Servers started by this tool, so later invocations can find them without a process scan
+PID_CACHE_PATH = os.path.expanduser("~/.cache/mcp_manager/pids.json")
+
+# Executables MCP servers run under (normalized by _launcher_name); other processes are
+# skipped before their cmdline is read. Each configured server's command is added on top.
+MCP_LAUNCHERS = frozenset({'node', 'npm', 'npx', 'deno', 'bun', 'python', 'uv', 'uvx', 'docker'})
+
+def _launcher_name(name: str) -> str:
+    """Normalize an executable or process name for launcher lookup ('Node.exe' -> 'node', 'python3.11' -> 'python')."""
+    name = os.path.basename(name).lower()
+    if name.endswith('.exe'):
+        name = name[:-4]
+    return name.rstrip('0123456789.') or name
+
+def _wait_for(predicate, timeout: float = 5.0, interval: float = 0.05) -> bool:
+    """Poll predicate until it returns true or timeout seconds pass; returns its last result."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return bool(predicate())
+
+@functools.lru_cache(maxsize=None)
+def _extract_package_name(args: Tuple[str, ...]) -> Optional[str]:
+    """Pick the npm package out of a server's args (the first scoped or mcp-named arg)."""
+    for arg in args:
+        if '@' in arg or 'mcp-' in arg or arg.endswith('-mcp'):
+            return arg
+    return None
+
+# Functions listed by get_server_functions, picked by the first substring found in the
+# package name; anything unrecognized gets the generic set.
+_FUNCTION_TABLES = (
+    ('filesystem', (
+        ("read_file", "Read the contents of a file", "path: string"),
+        ("write_file", "Write content to a file", "path: string, content: string"),
+        ("list_directory", "List contents of a directory", "path: string"),
+        ("create_directory", "Create a new directory", "path: string"),
+        ("delete_file", "Delete a file", "path: string"),
+        ("move_file", "Move or rename a file", "source: string, destination: string"),
+    )),
+    ('browser-tools', (
+        ("getConsoleLogs", "Get browser console logs", "None"),
+        ("getConsoleErrors", "Get browser console errors", "None"),
+        ("getNetworkLogs", "Get network request logs", "None"),
+        ("takeScreenshot", "Take a screenshot", "None"),
+        ("runSEOAudit", "Run SEO audit", "None"),
+        ("runDebuggerMode", "Start debugger mode", "None"),
+    )),
+    ('server-llm-txt', (
+        ("list_llm_txt", "List available LLM.txt files", "None"),
+        ("get_llm_txt", "Get contents of an LLM.txt file", "id: number, page: number"),
+        ("search_llm_txt", "Search within LLM.txt files", "id: number, queries: string[]"),
+    )),
+    ('mcp-shell', (
+        ("connect", "Connect to an MCP server", "url: string"),
+        ("disconnect", "Disconnect from current server", "None"),
+        ("list", "List available functions", "None"),
+        ("call", "Call a function", "function: string, params: object"),
+        ("help", "Show help for a function", "function: string"),
+    )),
+)
+
+# Generic MCP server functions
+_GENERIC_FUNCTIONS = (
+    ("start", "Start the server", "None"),
+    ("stop", "Stop the server", "None"),
+    ("status", "Get server status", "None"),
+    ("version", "Get server version", "None"),
+)
+
 class MCPServerManager:
     def __init__(self):
         self.cursor_config_path = os.path.expanduser("~/.cursor/mcp.json")
         self.config = self._load_cursor_config()
         self.registry = ServerRegistry()
+        self._server_matchers = self._build_server_matchers()
+        self._prefilter = self._build_prefilter()
+        self._launchers = self._build_launchers()
+        self._detect_cache: Optional[Tuple[float, List[Dict]]] = None
+        self._detect_lock = threading.Lock()
+        self._started_processes: Dict[str, subprocess.Popen] = {}
+        self._pid_cache_lock = threading.Lock()
         
     def _load_cursor_config(self) -> Dict:
         """Load Cursor's MCP configuration."""
         try:
-            with open(self.cursor_config_path, 'r') as f:
-                return json.load(f)
+            return load_json_cached(self.cursor_config_path)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             rprint(f"[red]Error loading Cursor MCP config: {str(e)}[/red]")
             return {"mcpServers": {}}
 
+    def _save_cursor_config(self):
+        """Write Cursor's MCP configuration back to disk, skipping the write if nothing changed."""
+        write_json_atomic(self.cursor_config_path, self.config)
+
     def _find_npm_path(self) -> str:
         """Find the npm executable path."""
-        try:
-            if os.name == 'nt':  # Windows
-                npm_path = subprocess.check_output(['where', 'npm']).decode().strip()
-            else:  # Unix-like
-                npm_path = subprocess.check_output(['which', 'npm']).decode().strip()
-            return npm_path
-        except subprocess.CalledProcessError:
+        npm_path = find_npm_path()
+        if not npm_path:
             rprint("[red]Error: npm not found. Please install Node.js and npm.[/red]")
             sys.exit(1)
+        return npm_path
+
+    def detect_cursor_mcp_servers(self, with_ports: bool = False) -> List[Dict]:
+        """Detect running Cursor MCP servers, reusing a scan younger than DETECT_CACHE_TTL.
+
+        Listening ports are only looked up with with_ports; otherwise 'ports' is left empty.
+        """
+        if self._detect_cache and time.monotonic() - self._detect_cache[0] < DETECT_CACHE_TTL:
+            mcp_servers = self._detect_cache[1]
+        else:
+            mcp_servers = self._scan_cursor_mcp_servers()
+            self._detect_cache = (time.monotonic(), mcp_servers)
+
+        return self._with_ports(mcp_servers) if with_ports else list(mcp_servers)
+
+    def detect_running_map(self) -> Dict[str, Dict]:
+        """Running servers keyed by name (the first matching process wins, as with a list scan)."""
+        running = {}
+        for server in self.detect_cursor_mcp_servers():
+            running.setdefault(server['name'], server)
+        return running
+
+    def cache_clear(self):
+        """Forget the cached process scan and rebuild the process matchers from the current config."""
+        with self._detect_lock:
+            self._detect_cache = None
+        self._server_matchers = self._build_server_matchers()
+        self._prefilter = self._build_prefilter()
+        self._launchers = self._build_launchers()
+
+    def _update_detect_cache(self, server_name: str, server_info: Optional[Dict] = None):
+        """Record a start (server_info given) or stop in the cached scan instead of rescanning."""
+        with self._detect_lock:
+            if self._detect_cache is None:
+                return
+            servers = [s for s in self._detect_cache[1] if s['name'] != server_name]
+            if server_info:
+                servers.append(server_info)
+            self._detect_cache = (time.monotonic(), servers)
 
-    def detect_cursor_mcp_servers(self) -> List[Dict]:
-        """Detect running Cursor MCP servers."""
+    def _scan_cursor_mcp_servers(self) -> List[Dict]:
+        """Scan the process table for running Cursor MCP servers."""
         mcp_servers = []
         
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'connections']):
+        if self._prefilter is None:
+            return mcp_servers  # No configured server can be identified on a command line
+
+        for pid, cmdline in self._iter_launcher_processes():
             try:
-                cmdline = proc.info['cmdline']
-                if not cmdline:
+                # Join once per process; every server's needles are checked against the same string
+                cmd_str = ' '.join(cmdline)
+
+                # Almost every process matches no server at all; drop those with a single search
+                if not self._prefilter.search(cmd_str):
                     continue
 
                 # Match against known MCP servers from config
-                for server_name, server_config in self.config['mcpServers'].items():
-                    if self._is_mcp_server_process(cmdline, server_config):
-                        connections = proc.connections()
-                        ports = [conn.laddr.port for conn in connections if conn.status == 'LISTEN']
+                for server_name in self._server_matchers:
+                    if self._is_mcp_server_process(cmd_str, server_name):
+                        proc = psutil.Process(pid)
                         
                         server_info = {
                             'name': server_name,
                             'pid': proc.pid,
-                            'ports': ports,
-                            'command': ' '.join(cmdline),
+                            'ports': [],  # Filled in by detect_cursor_mcp_servers(with_ports=True)
+                            'command': cmd_str,
                             'status': 'Running',
-                            'config': server_config
+                            'config': self.config['mcpServers'][server_name]
                         }
                         
                         try:
@@ -84,28 +220,115 @@ class MCPServerManager:
 
         return mcp_servers
 
-    def _is_mcp_server_process(self, cmdline: List[str], server_config: Dict) -> bool:
-        """Check if a process matches an MCP server configuration."""
-        if not cmdline:
-            return False
-            
-        expected_cmd = server_config['command']
-        expected_args = server_config['args']
-        
-        # Convert both to string for easier comparison
-        cmd_str = ' '.join(cmdline)
-        
-        # Check for both the exact command and the npm/npx package name
-        for arg in expected_args:
-            if '@modelcontextprotocol' in arg or 'mcp-' in arg:
-                if arg in cmd_str:
-                    return True
-        
-        return False
+    def _with_ports(self, servers: List[Dict]) -> List[Dict]:
+        """Copies of detected servers with their listening ports filled in."""
+        if not servers:
+            return []
+
+        # One system-wide socket scan covers every server
+        ports_by_pid = self._listening_ports_by_pid()
+        if ports_by_pid is None:
+            # No system-wide view (e.g. macOS without root); ask each process alone
+            return [dict(server, ports=self.get_ports(server['pid'])) for server in servers]
+        return [dict(server, ports=ports_by_pid.get(server['pid'], [])) for server in servers]
+
+    def get_ports(self, pid: int) -> List[int]:
+        """Listening TCP/UDP ports of a single process (empty if it can't be inspected)."""
+        try:
+            connections = psutil.Process(pid).connections(kind='inet')
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return []
+        return [conn.laddr.port for conn in connections if conn.status == 'LISTEN']
+
+    def _listening_ports_by_pid(self) -> Optional[Dict[int, List[int]]]:
+        """Map pid -> listening TCP/UDP ports in one pass, or None if that needs more privileges."""
+        try:
+            connections = psutil.net_connections(kind='inet')
+        except psutil.AccessDenied:
+            return None
+
+        ports_by_pid = {}
+        for conn in connections:
+            if conn.status == 'LISTEN' and conn.pid:
+                ports_by_pid.setdefault(conn.pid, []).append(conn.laddr.port)
+        return ports_by_pid
+
+    def _iter_launcher_processes(self):
+        """Yield (pid, cmdline) for every process running under one of the known launchers."""
+        if sys.platform.startswith('linux'):
+            yield from self._iter_launcher_processes_linux()
+            return
+
+        for proc in psutil.process_iter(['pid', 'name']):
+            try:
+                # The name is already fetched; only read cmdline for processes that could be a server
+                if _launcher_name(proc.info['name'] or '') not in self._launchers:
+                    continue
+                cmdline = proc.cmdline()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            if cmdline:
+                yield proc.pid, cmdline
+
+    def _iter_launcher_processes_linux(self):
+        """Linux fast path for _iter_launcher_processes: read /proc/<pid>/comm and cmdline directly."""
+        for entry in os.scandir('/proc'):
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry.name}/comm', 'rb') as f:
+                    comm = f.read().rstrip(b'\n').decode(errors='replace')
+                # comm is cut at 15 characters, so a name that long can't be ruled out here
+                if len(comm) < 15 and _launcher_name(comm) not in self._launchers:
+                    continue
+                with open(f'/proc/{entry.name}/cmdline', 'rb') as f:
+                    raw = f.read()
+            except OSError:
+                continue  # Exited mid-scan or not readable
+
+            cmdline = [arg.decode(errors='replace') for arg in raw.split(b'\0') if arg]
+            if cmdline:
+                yield int(entry.name), cmdline
+
+    def _build_launchers(self) -> frozenset:
+        """Known launchers plus the command of every configured server."""
+        return MCP_LAUNCHERS | {
+            _launcher_name(server_config['command'])
+            for server_config in self.config['mcpServers'].values() if server_config.get('command')
+        }
+
+    def _server_needles(self, server_config: Dict) -> frozenset:
+        """The args that identify a server's process on a command line."""
+        return frozenset(
+            arg for arg in server_config.get('args') or ()
+            if '@modelcontextprotocol' in arg or 'mcp-' in arg
+        )
+
+    def _build_prefilter(self) -> Optional[Pattern]:
+        """Compile one pattern over every server's needles, to reject non-server processes in a single search."""
+        needles = frozenset().union(*(
+            self._server_needles(server_config) for server_config in self.config['mcpServers'].values()
+        ))
+        return re.compile('|'.join(map(re.escape, needles))) if needles else None
+
+    def _build_server_matchers(self) -> Dict[str, Optional[Pattern]]:
+        """Compile, per configured server, one pattern over the args that identify its process."""
+        matchers = {}
+        for server_name, server_config in self.config['mcpServers'].items():
+            needles = self._server_needles(server_config)
+            # A server without identifying args can't be matched (an empty pattern would match everything)
+            matchers[server_name] = re.compile('|'.join(map(re.escape, needles))) if needles else None
+        return matchers
+
+    def _is_mcp_server_process(self, cmd_str: str, server_name: str) -> bool:
+        """Check if a joined process command line matches an MCP server's identifying args."""
+        # Check for the npm/npx package name anywhere in the command line
+        matcher = self._server_matchers.get(server_name)
+        return bool(matcher and matcher.search(cmd_str))
 
     def list_servers(self):
         """List all Cursor MCP servers (both running and configured)."""
-        detected_servers = self.detect_cursor_mcp_servers()
+        running = self.detect_running_map()
         
         table = Table(title="Cursor MCP Servers")
         table.add_column("Name", style="cyan")
@@ -114,15 +337,91 @@ class MCPServerManager:
         
         # Add all configured servers
         for name, config in self.config['mcpServers'].items():
-            running_server = next((s for s in detected_servers if s['name'] == name), None)
-            
-            status = "Running" if running_server else "Stopped"
+            status = "Running" if name in running else "Stopped"
             command = f"{config['command']} {' '.join(config['args'])}"
             
             table.add_row(name, status, command)
         
         console.print(table)
 
+    def _pid_cache_load(self) -> Dict[str, Dict]:
+        """Load the pid cache of servers started by this tool."""
+        try:
+            return load_json_cached(PID_CACHE_PATH)
+        except (OSError, ValueError):
+            return {}
+
+    def _pid_cache_save(self, entries: Dict[str, Dict]):
+        """Save the pid cache; it is only an optimization, so failures are ignored."""
+        try:
+            os.makedirs(os.path.dirname(PID_CACHE_PATH), exist_ok=True)
+            write_json_atomic(PID_CACHE_PATH, entries)
+        except OSError:
+            pass
+
+    def _remember_pid(self, server_name: str, pid: int, cmd: List[str]):
+        """Record a freshly started server in the pid cache."""
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return
+        with self._pid_cache_lock:
+            entries = dict(self._pid_cache_load())
+            entries[server_name] = {'pid': pid, 'create_time': create_time, 'cmd': ' '.join(cmd)}
+            self._pid_cache_save(entries)
+
+    def _forget_pids(self, server_names: List[str]):
+        """Drop servers from the pid cache."""
+        with self._pid_cache_lock:
+            entries = self._pid_cache_load()
+            if any(name in entries for name in server_names):
+                self._pid_cache_save({name: entry for name, entry in entries.items() if name not in server_names})
+
+    def _find_cached_server(self, server_name: str) -> Optional[Dict]:
+        """Look a server up in the pid cache, checking the pid still belongs to the process we started."""
+        entry = self._pid_cache_load().get(server_name)
+        if not entry or server_name not in self.config['mcpServers']:
+            return None
+        try:
+            # A matching create time rules out the pid having been reused by another process
+            if abs(psutil.Process(entry['pid']).create_time() - entry['create_time']) >= 1e-3:
+                raise psutil.NoSuchProcess(entry['pid'])
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            self._forget_pids([server_name])
+            return None
+        except psutil.AccessDenied:
+            return None
+
+        return {
+            'name': server_name,
+            'pid': entry['pid'],
+            'ports': [],
+            'command': entry['cmd'],
+            'status': 'Running',
+            'config': self.config['mcpServers'][server_name]
+        }
+
+    def _find_running_server(self, server_name: str) -> Optional[Dict]:
+        """Find a running server, trying the pid cache before a full process scan."""
+        cached = self._find_cached_server(server_name)
+        if cached:
+            return cached
+        return self.detect_running_map().get(server_name)
+
+    def is_running(self, server_name: str) -> bool:
+        """Check whether a server's process is alive right now.
+
+        Never answered from the detect cache: stop_server() rewrites that cache itself, so polling
+        it after a stop would report the server gone without looking at the process.
+        """
+        if self._find_cached_server(server_name):
+            return True  # Its pid was just checked against the live process's create time
+
+        servers = self._scan_cursor_mcp_servers()
+        with self._detect_lock:
+            self._detect_cache = (time.monotonic(), servers)
+        return any(server['name'] == server_name for server in servers)
+
     def start_server(self, server_name: str):
         """Start a specific MCP server."""
         if server_name not in self.config['mcpServers']:
@@ -130,79 +429,173 @@ class MCPServerManager:
             return False
 
         # Check if already running
-        running_servers = self.detect_cursor_mcp_servers()
-        if any(s['name'] == server_name for s in running_servers):
+        if self._find_running_server(server_name):
             rprint(f"[yellow]Server '{server_name}' is already running[/yellow]")
             return True
 
+        return self._launch_server(server_name)
+
+    def _launch_server(self, server_name: str) -> bool:
+        """Launch a configured server that is known not to be running."""
         server_config = self.config['mcpServers'][server_name]
         cmd = [server_config['command']] + server_config['args']
 
         try:
-            # Start the server in the background
+            # Start the server in the background. Nothing ever reads its output, and an undrained
+            # pipe would block the server once ~64KB is buffered (or raise EPIPE once we exit)
             process = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 start_new_session=True  # This makes it run in the background
             )
             rprint(f"[green]Started server '{server_name}' (PID: {process.pid})[/green]")
+            self._started_processes[server_name] = process
+            self._remember_pid(server_name, process.pid, cmd)
+            self._update_detect_cache(server_name, {
+                'name': server_name,
+                'pid': process.pid,
+                'ports': [],
+                'command': ' '.join(cmd),
+                'status': 'Running',
+                'config': server_config,
+                'working_dir': os.getcwd()
+            })
             return True
-        except subprocess.CalledProcessError as e:
+        except (OSError, subprocess.SubprocessError) as e:
             rprint(f"[red]Error starting server '{server_name}': {e}[/red]")
             return False
 
+    def _wait_for_server_ready(self, server_name: str, timeout: float = SERVER_READY_TIMEOUT) -> bool:
+        """Wait until a server started by this manager listens on a port, exits, or times out.
+
+        Servers that talk over stdio never listen, so still being alive at the deadline counts as ready.
+        """
+        process = self._started_processes.get(server_name)
+        if process is None:
+            return False
+
+        # On Linux >= 5.3 a pidfd becomes readable the moment the process exits, so a crash
+        # ends the wait immediately instead of at the next polling tick
+        pidfd = None
+        poller = None
+        if hasattr(os, 'pidfd_open'):
+            try:
+                pidfd = os.pidfd_open(process.pid)
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+            except OSError:
+                pidfd = None
+
+        try:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if process.poll() is not None:
+                    self._forget_pids([server_name])
+                    self._update_detect_cache(server_name)
+                    return False
+                try:
+                    # npx/npm exec launchers hand the actual listening socket to a child process
+                    parent = psutil.Process(process.pid)
+                    for proc in [parent] + parent.children(recursive=True):
+                        if any(conn.status == 'LISTEN' for conn in proc.connections(kind='inet')):
+                            return True
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    pass
+
+                if pidfd is not None:
+                    poller.poll(20)
+                else:
+                    time.sleep(0.02)
+
+            return process.poll() is None
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+
     def stop_server(self, server_name: str):
         """Stop a specific MCP server."""
-        running_servers = self.detect_cursor_mcp_servers()
-        server = next((s for s in running_servers if s['name'] == server_name), None)
+        server = self._find_running_server(server_name)
         
         if not server:
             rprint(f"[yellow]Server '{server_name}' is not running[/yellow]")
             return True  # Return True since there's nothing to stop
 
         try:
-            # Get the process group
-            process = psutil.Process(server['pid'])
-            
-            # Try to get all child processes
-            try:
-                children = process.children(recursive=True)
-                for child in children:
-                    try:
-                        child.terminate()
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+            if self._terminate_processes([server['pid']]):
+                rprint(f"[red]Error stopping server '{server_name}': permission denied[/red]")
+                return False
 
-            # Try graceful termination first
-            try:
-                # Send SIGTERM to the process group
-                os.killpg(os.getpgid(server['pid']), signal.SIGTERM)
-                time.sleep(1)  # Give it a moment to terminate
-            except (ProcessLookupError, ProcessGroupError):
-                try:
-                    # If process group termination fails, try individual process
-                    process.terminate()
-                    process.wait(timeout=5)
-                except (psutil.TimeoutExpired, psutil.NoSuchProcess):
-                    try:
-                        # If graceful termination fails, try force kill
-                        process.kill()
-                        process.wait(timeout=2)
-                    except (psutil.NoSuchProcess, psutil.TimeoutExpired):
-                        pass  # Process might already be gone
-                
+            self._reap_started_process(server_name)
+            self._forget_pids([server_name])
             rprint(f"[green]Stopped server '{server_name}'[/green]")
-            return True
-        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-            rprint(f"[yellow]Server '{server_name}' was already stopped[/yellow]")
+            self._update_detect_cache(server_name)
             return True
         except Exception as e:
             rprint(f"[red]Error stopping server '{server_name}': {str(e)}[/red]")
             return False
 
+    def _terminate_processes(self, pids: List[int]) -> List[int]:
+        """Stop several server processes together and return the pids that could not be signalled.
+
+        Every server gets SIGTERM first, then all of them share one grace period before
+        survivors get SIGKILL. A server that leads its own process group (start_server
+        launches with start_new_session=True) is signalled with one killpg for its whole tree.
+        """
+        own_group = os.getpgrp() if hasattr(os, 'getpgrp') else None
+        group_of = {}  # Process -> pgid, for processes signalled through their group
+        processes = []
+        failed = []
+
+        for pid in pids:
+            try:
+                process = psutil.Process(pid)
+                tree = process.children(recursive=True) + [process]
+                pgid = os.getpgid(pid) if hasattr(os, 'getpgid') else None
+                # A server spawned by Cursor shares the editor's group, so only use killpg
+                # on groups the server itself leads
+                if pgid == pid and pgid != own_group:
+                    os.killpg(pgid, signal.SIGTERM)
+                    group_of.update((proc, pgid) for proc in tree)
+                else:
+                    for proc in tree:
+                        try:
+                            proc.terminate()
+                        except psutil.NoSuchProcess:
+                            pass
+                processes.extend(tree)
+            except (ProcessLookupError, psutil.NoSuchProcess):
+                continue  # Already gone
+            except (PermissionError, psutil.AccessDenied):
+                failed.append(pid)
+
+        if not processes:
+            return failed
+
+        # Returns as soon as everything has exited rather than always sitting out the grace period
+        _, alive = psutil.wait_procs(processes, timeout=STOP_GRACE_PERIOD)
+        if alive:
+            for pgid in {group_of[proc] for proc in alive if proc in group_of}:
+                try:
+                    os.killpg(pgid, signal.SIGKILL)
+                except (ProcessLookupError, PermissionError):
+                    pass  # Group already exited
+            for proc in alive:
+                if proc not in group_of:
+                    try:
+                        proc.kill()
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        pass
+            psutil.wait_procs(alive, timeout=2)
+
+        return failed
+
+    def _reap_started_process(self, server_name: str):
+        """Collect the exit status of a server this manager started, so it doesn't linger as a zombie."""
+        process = self._started_processes.pop(server_name, None)
+        if process is not None:
+            process.poll()
+
     def get_server_functions(self, server_name: str):
         """Get detailed information about a server's available functions."""
         if server_name not in self.config['mcpServers']:
@@ -212,31 +605,18 @@ class MCPServerManager:
         server_config = self.config['mcpServers'][server_name]
         
         # First check if the server is running
-        running_servers = self.detect_cursor_mcp_servers()
-        running_server = next((s for s in running_servers if s['name'] == server_name), None)
+        running_server = self._find_running_server(server_name)
         
         if not running_server:
             rprint(f"[yellow]Note: Server '{server_name}' is not running. Starting it temporarily...[/yellow]")
-            self.start_server(server_name)
-            # Give it a moment to start
-            time.sleep(2)
-            running_servers = self.detect_cursor_mcp_servers()
-            running_server = next((s for s in running_servers if s['name'] == server_name), None)
-            if not running_server:
+            if not self.start_server(server_name) or not self._wait_for_server_ready(server_name):
                 rprint(f"[red]Error: Could not start server '{server_name}'[/red]")
                 return
 
         # Try to get server information from package
         try:
             # Find the package name from args
-            package_name = None
-            for arg in server_config['args']:
-                if '@' in arg:
-                    package_name = arg
-                    break
-                elif 'mcp-' in arg or arg.endswith('-mcp'):
-                    package_name = arg
-                    break
+            package_name = _extract_package_name(tuple(server_config['args']))
 
             if not package_name:
                 rprint(f"[red]Error: Could not determine package name for '{server_name}'[/red]")
@@ -252,47 +632,8 @@ class MCPServerManager:
             table.add_column("Description", style="yellow")
             table.add_column("Parameters", style="green")
 
-            # Get function information based on server type
-            if 'filesystem' in package_name:
-                functions = [
-                    ("read_file", "Read the contents of a file", "path: string"),
-                    ("write_file", "Write content to a file", "path: string, content: string"),
-                    ("list_directory", "List contents of a directory", "path: string"),
-                    ("create_directory", "Create a new directory", "path: string"),
-                    ("delete_file", "Delete a file", "path: string"),
-                    ("move_file", "Move or rename a file", "source: string, destination: string"),
-                ]
-            elif 'browser-tools' in package_name:
-                functions = [
-                    ("getConsoleLogs", "Get browser console logs", "None"),
-                    ("getConsoleErrors", "Get browser console errors", "None"),
-                    ("getNetworkLogs", "Get network request logs", "None"),
-                    ("takeScreenshot", "Take a screenshot", "None"),
-                    ("runSEOAudit", "Run SEO audit", "None"),
-                    ("runDebuggerMode", "Start debugger mode", "None"),
-                ]
-            elif 'server-llm-txt' in package_name:
-                functions = [
-                    ("list_llm_txt", "List available LLM.txt files", "None"),
-                    ("get_llm_txt", "Get contents of an LLM.txt file", "id: number, page: number"),
-                    ("search_llm_txt", "Search within LLM.txt files", "id: number, queries: string[]"),
-                ]
-            elif 'mcp-shell' in package_name:
-                functions = [
-                    ("connect", "Connect to an MCP server", "url: string"),
-                    ("disconnect", "Disconnect from current server", "None"),
-                    ("list", "List available functions", "None"),
-                    ("call", "Call a function", "function: string, params: object"),
-                    ("help", "Show help for a function", "function: string"),
-                ]
-            else:
-                # Generic MCP server functions
-                functions = [
-                    ("start", "Start the server", "None"),
-                    ("stop", "Stop the server", "None"),
-                    ("status", "Get server status", "None"),
-                    ("version", "Get server version", "None"),
-                ]
+            functions = next((funcs for needle, funcs in _FUNCTION_TABLES if needle in package_name),
+                             _GENERIC_FUNCTIONS)
 
             for func_name, description, params in functions:
                 table.add_row(func_name, description, params)
@@ -304,64 +645,78 @@ class MCPServerManager:
 
     def uninstall_server(self, server_name: str):
         """Uninstall a specific MCP server."""
-        if server_name not in self.config['mcpServers']:
-            rprint(f"[red]Error: Server '{server_name}' not found in configuration[/red]")
-            return False
+        return self.uninstall_servers([server_name])
+
+    def uninstall_servers(self, server_names: List[str]) -> bool:
+        """Uninstall MCP servers with a single npm run; True if every one was uninstalled."""
+        # Server name -> npm package, for each server that gets uninstalled
+        packages = {}
+        all_ok = True
+        running = None
+
+        for server_name in dict.fromkeys(server_names):
+            if server_name not in self.config['mcpServers']:
+                rprint(f"[red]Error: Server '{server_name}' not found in configuration[/red]")
+                all_ok = False
+                continue
 
-        # First stop the server if it's running
-        running_servers = self.detect_cursor_mcp_servers()
-        if any(s['name'] == server_name for s in running_servers):
-            rprint(f"[yellow]Stopping server '{server_name}' before uninstalling...[/yellow]")
-            if not self.stop_server(server_name):
-                rprint(f"[red]Failed to stop server '{server_name}'. Aborting uninstall.[/red]")
-                return False
-            time.sleep(2)  # Give it time to stop
+            # Try to find the package name from args
+            package_name = _extract_package_name(tuple(self.config['mcpServers'][server_name]['args']))
+            if not package_name:
+                rprint(f"[red]Error: Could not determine package name for '{server_name}'[/red]")
+                all_ok = False
+                continue
 
-        server_config = self.config['mcpServers'][server_name]
-        
-        # Try to find the package name from args
-        package_name = None
-        for arg in server_config['args']:
-            if '@' in arg:
-                package_name = arg
-                break
-            elif 'mcp-' in arg or arg.endswith('-mcp'):
-                package_name = arg
-                break
-
-        if not package_name:
-            rprint(f"[red]Error: Could not determine package name for '{server_name}'[/red]")
+            # First stop the server if it's running
+            if running is None:
+                running = self.detect_running_map()
+            if server_name in running:
+                rprint(f"[yellow]Stopping server '{server_name}' before uninstalling...[/yellow]")
+                if not self.stop_server(server_name):
+                    rprint(f"[red]Failed to stop server '{server_name}'. Aborting uninstall.[/red]")
+                    all_ok = False
+                    continue
+                _wait_for(lambda: not self.is_running(server_name))
+
+            packages[server_name] = package_name
+
+        if not packages:
             return False
 
+        package_names = list(dict.fromkeys(packages.values()))
         try:
-            # Uninstall the package using npm
-            rprint(f"[yellow]Uninstalling {package_name}...[/yellow]")
+            # Uninstall the packages using npm
+            rprint(f"[yellow]Uninstalling {', '.join(package_names)}...[/yellow]")
             
-            # Use shell=True to prevent process termination issues
+            # No shell in between, and npm's stdout is never read so don't buffer it
             result = subprocess.run(
-                f"npm uninstall -g {package_name}",
-                shell=True,
-                capture_output=True,
+                [self._find_npm_path(), 'uninstall', '-g', *package_names],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=30  # Add timeout to prevent hanging
+                timeout=30 * len(package_names)  # Add timeout to prevent hanging
             )
             
             if result.returncode != 0:
                 rprint(f"[red]Error uninstalling server: {result.stderr}[/red]")
                 return False
 
-            # Remove from Cursor's config
-            self.config['mcpServers'].pop(server_name)
+            # Remove from Cursor's config (a new dict, as the loaded one is shared with the parse cache)
+            self.config = dict(self.config, mcpServers={
+                name: server_config for name, server_config in self.config['mcpServers'].items()
+                if name not in packages
+            })
             
             # Save the updated config
-            with open(self.cursor_config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            self._save_cursor_config()
+            self.cache_clear()
 
-            rprint(f"[green]Successfully uninstalled '{server_name}'[/green]")
-            return True
+            for server_name in packages:
+                rprint(f"[green]Successfully uninstalled '{server_name}'[/green]")
+            return all_ok
 
         except subprocess.TimeoutExpired:
-            rprint(f"[red]Timeout while uninstalling {package_name}[/red]")
+            rprint(f"[red]Timeout while uninstalling {', '.join(package_names)}[/red]")
             return False
         except Exception as e:
             rprint(f"[red]Error: {str(e)}[/red]")
@@ -369,27 +724,43 @@ class MCPServerManager:
 
     def start_all_servers(self):
         """Start all configured MCP servers."""
-        success_count = 0
         total_count = len(self.config['mcpServers'])
-        
+
+        # One scan up front; the launches themselves don't need to rescan
+        running = self.detect_running_map()
+        to_start = []
         for server_name in self.config['mcpServers']:
-            rprint(f"Starting {server_name}...")
-            if self.start_server(server_name):
-                success_count += 1
-            time.sleep(1)  # Brief pause between starts
+            if server_name in running:
+                rprint(f"[yellow]Server '{server_name}' is already running[/yellow]")
+            else:
+                rprint(f"Starting {server_name}...")
+                to_start.append(server_name)
+
+        success_count = total_count - len(to_start)
+        if to_start:
+            with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_STARTS, len(to_start))) as executor:
+                success_count += sum(executor.map(self._launch_server, to_start))
         
         rprint(f"[green]Started {success_count} out of {total_count} servers[/green]")
 
     def stop_all_servers(self):
         """Stop all running MCP servers."""
         running_servers = self.detect_cursor_mcp_servers()
-        success_count = 0
-        
         for server in running_servers:
             rprint(f"Stopping {server['name']}...")
-            if self.stop_server(server['name']):
-                success_count += 1
-            time.sleep(1)  # Brief pause between stops
+
+        # Signal every server before waiting on any of them
+        failed = set(self._terminate_processes([s['pid'] for s in running_servers]))
+        success_count = 0
+        self._forget_pids([s['name'] for s in running_servers if s['pid'] not in failed])
+
+        for server in running_servers:
+            if server['pid'] in failed:
+                rprint(f"[red]Error stopping server '{server['name']}': permission denied[/red]")
+                continue
+            self._reap_started_process(server['name'])
+            self._update_detect_cache(server['name'])
+            success_count += 1
         
         rprint(f"[green]Stopped {success_count} out of {len(running_servers)} servers[/green]")
 
@@ -417,6 +788,10 @@ class MCPServerManager:
         """Install a server from the registry."""
         return self.registry.install_server(server_name)
 
+    def install_many_from_registry(self, server_names: List[str]):
+        """Install several servers from the registry with a single npm run."""
+        return self.registry.install_servers(server_names)
+
     def update_registry(self):
         """Update the local registry cache."""
         self.registry.update_registry()
@@ -427,8 +802,8 @@ def cli():
     """Cursor MCP Server Manager - Detect and manage Cursor MCP servers."""
     pass
 
-@cli.command()
-def list():
+@cli.command('list')
+def list_command():
     """List all Cursor MCP servers and their status."""
     manager = MCPServerManager()
     manager.list_servers()
@@ -454,7 +829,7 @@ def restart(name):
     manager = MCPServerManager()
     manager.stop_server(name)
     click.echo("Waiting for server to stop...")
-    time.sleep(2)  # Give it a moment to fully stop
+    _wait_for(lambda: not manager.is_running(name), timeout=1.5)
     manager.start_server(name)
 
 @cli.command()
@@ -465,12 +840,13 @@ def functions(name):
     manager.get_server_functions(name)
 
 @cli.command()
-@click.argument('name')
-def uninstall(name):
-    """Uninstall a specific MCP server."""
-    if click.confirm(f"Are you sure you want to uninstall '{name}'?"):
+@click.argument('names', nargs=-1, required=True)
+def uninstall(names):
+    """Uninstall one or more MCP servers."""
+    quoted = ', '.join(f"'{name}'" for name in names)
+    if click.confirm(f"Are you sure you want to uninstall {quoted}?"):
         manager = MCPServerManager()
-        manager.uninstall_server(name)
+        manager.uninstall_servers(list(names))
 
 @cli.command()
 def start_all():
@@ -491,11 +867,11 @@ def available():
     manager.list_available_servers()
 
 @cli.command()
-@click.argument('name')
-def install(name):
-    """Install a server from the registry."""
+@click.argument('names', nargs=-1, required=True)
+def install(names):
+    """Install one or more servers from the registry."""
     manager = MCPServerManager()
-    manager.install_from_registry(name)
+    manager.install_many_from_registry(list(names))
 
 @cli.command()
 def update():
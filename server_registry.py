@@ -1,34 +1,199 @@
+import functools
 import json
-import requests
+import mmap
+import os
+import re
+import shutil
+import stat
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from rich import print as rprint
 import time
-from datetime import datetime
 import subprocess
 import sys
 
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; the stdlib encoder produces the same indented layout
+    orjson = None
+
+# (connect, read) timeouts for registry fetches: give up on an unreachable host quickly,
+# but allow a slow download of the body
+REGISTRY_TIMEOUT = (3.05, 10)
+
+# Placeholders in registry args, e.g. "{api_key}" or "{install_dir}"
+_VAR_PATTERN = re.compile(r'\{([^}]+)\}')
+
+def _substitute(arg: str, values: Dict[str, str]) -> str:
+    """Replace every known {placeholder} in arg in one pass, leaving unknown ones as they are."""
+    if '{' not in arg:
+        return arg
+    return _VAR_PATTERN.sub(lambda m: values.get(m.group(1), m.group(0)), arg)
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON bytes; orjson's JSONDecodeError subclasses json's, so callers catch either."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _dumps(data: Any) -> bytes:
+    """Serialize data as 2-space indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+# Files at least this big are mapped rather than read into a bytes copy when orjson can
+# parse straight from the mapping; below it, read() is cheaper than setting up the map
+_MMAP_MIN_SIZE = 64 * 1024
+
+# Parsed JSON documents keyed by path; an entry is reused while (st_mtime_ns, st_size) match
+_JSON_CACHE: Dict[str, Tuple[int, int, Any]] = {}
+
+def load_json_cached(path, st: Optional[os.stat_result] = None) -> Any:
+    """Load a JSON file, skipping the parse when the file is unchanged since the last load.
+
+    The result is shared with the cache, so treat it as read-only: to change it, build a new
+    object around the parts that change. Callers that have just stat'ed the file can pass the
+    result as st to avoid a second stat.
+    """
+    path = str(path)
+    if st is None:
+        st = os.stat(path)
+    cached = _JSON_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    # Read bytes so the JSON encoding is detected rather than taken from the locale
+    with open(path, 'rb') as f:
+        if orjson is not None and st.st_size >= _MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                data = orjson.loads(view)
+        else:
+            data = _loads(f.read())
+    _JSON_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+def write_json_atomic(path, data: Any) -> bool:
+    """Write data as indented JSON via a temp file and rename; returns False if the file already held it.
+
+    data becomes the cached parse of the file, so it must not be mutated afterwards. A symlinked
+    path is written through to its target, and an existing file keeps its permissions.
+    """
+    path = str(path)
+    mode = None
+    try:
+        # If the file is exactly what we last loaded or wrote, compare objects and skip serializing
+        st = os.stat(path)
+        mode = stat.S_IMODE(st.st_mode)
+        cached = _JSON_CACHE.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size and cached[2] == data:
+            return False
+    except FileNotFoundError:
+        pass
+
+    payload = _dumps(data)
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+
+    # Write through a symlink (e.g. a dotfiles-managed mcp.json) to the file it points at, using a
+    # uniquely named temp file beside it: concurrent writers never share one, and a crash
+    # mid-write can't truncate the original
+    target = os.path.realpath(path)
+    directory, name = os.path.split(target)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; an existing file keeps its own mode (new files stay 0600)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    # Prime the parse cache so the next load doesn't re-read what was just written
+    st = os.stat(path)
+    _JSON_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return True
+
+@functools.lru_cache(maxsize=None)
+def find_npm_path() -> Optional[str]:
+    """Find the npm executable on PATH, or None; the lookup is done once per process."""
+    return shutil.which('npm')
+
+@functools.lru_cache(maxsize=None)
+def find_npm_root() -> Optional[str]:
+    """Global node_modules directory from 'npm root -g', or None; npm is only run once per process."""
+    npm_path = find_npm_path()
+    if not npm_path:
+        return None
+    result = subprocess.run(
+        [npm_path, 'root', '-g'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
 class ServerRegistry:
     def __init__(self, registry_url: str = "https://raw.githubusercontent.com/OJamals/mcp-registry/main/registry.json"):
         self.registry_url = registry_url
-        self.local_registry_path = Path.home() / ".cursor" / "mcp_registry.json"
+        self.config_dir = Path.home() / ".cursor"
+        self.local_registry_path = self.config_dir / "mcp_registry.json"
+        self.cursor_config_path = self.config_dir / "mcp.json"
         self.cache_duration = 3600  # 1 hour in seconds
+        self._config_dir_created = False
+        self._session: Optional['requests.Session'] = None  # Created on the first fetch
+
+    def _get_session(self) -> 'requests.Session':
+        """A keep-alive session that retries transient registry failures, created on first use.
+
+        requests (and urllib3 and ssl under it) is only imported here, so commands that never
+        touch the network don't pay for it at startup.
+        """
+        if self._session is not None:
+            return self._session
 
-    def _load_local_registry(self) -> Optional[Dict]:
-        """Load the local registry file if it exists and is not expired."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        # Retry refused connections more readily than reads that may already have reached the server;
+        # only idempotent methods (urllib3's default) are ever retried
+        retries = Retry(total=3, connect=2, read=1, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retries))
+        self._session = session
+        return session
+
+    def _load_local_registry(self, allow_expired: bool = False) -> Optional[Dict]:
+        """Load the local registry file if it exists and is not expired (or regardless, with allow_expired)."""
         try:
-            if not self.local_registry_path.exists():
-                return None
+            st = self.local_registry_path.stat()
+        except FileNotFoundError:
+            return None
 
-            with open(self.local_registry_path, 'r') as f:
-                data = json.load(f)
-                
-            # Check if cache is expired
-            last_updated = datetime.fromisoformat(data.get('last_updated', '2000-01-01'))
-            if (datetime.now() - last_updated).total_seconds() > self.cache_duration:
+        try:
+            # The file's mtime is when the registry was last fetched (or confirmed unchanged)
+            if not allow_expired and time.time() - st.st_mtime > self.cache_duration:
                 return None
-                
-            return data
+
+            return load_json_cached(self.local_registry_path, st)
         except Exception as e:
             rprint(f"[yellow]Warning: Could not load local registry: {str(e)}[/yellow]")
             return None
@@ -36,175 +201,228 @@ class ServerRegistry:
     def _save_local_registry(self, data: Dict):
         """Save the registry data to local file."""
         try:
-            self.local_registry_path.parent.mkdir(parents=True, exist_ok=True)
-            data['last_updated'] = datetime.now().isoformat()
-            with open(self.local_registry_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._ensure_config_dir()
+            # Temp file + rename, so an interrupted save can't leave a truncated registry behind
+            if not write_json_atomic(self.local_registry_path, data):
+                self._touch_local_registry()  # Same content; still restart the freshness window
         except Exception as e:
             rprint(f"[red]Error saving local registry: {str(e)}[/red]")
 
+    def _touch_local_registry(self):
+        """Mark the local registry as freshly checked without rewriting it."""
+        try:
+            os.utime(self.local_registry_path)
+        except OSError as e:
+            rprint(f"[yellow]Warning: Could not update local registry timestamp: {str(e)}[/yellow]")
+
+    def _ensure_config_dir(self):
+        """Create ~/.cursor on the first write of this session; later writes skip the makedirs stats."""
+        if not self._config_dir_created:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            self._config_dir_created = True
+
     def update_registry(self) -> Dict:
         """Fetch the latest registry from the remote URL."""
+        # Even an expired copy lets the server answer 304 instead of resending the whole registry
+        cached = self._load_local_registry(allow_expired=True)
         try:
-            # Add timestamp to bypass caching
-            timestamp = int(time.time())
-            url = f"{self.registry_url}?t={timestamp}"
-            rprint(f"[yellow]Fetching registry from: {url}[/yellow]")
-            response = requests.get(url)
+            headers = {}
+            if cached and cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached and cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+            rprint(f"[yellow]Fetching registry from: {self.registry_url}[/yellow]")
+            response = self._get_session().get(self.registry_url, headers=headers, timeout=REGISTRY_TIMEOUT)
+            if response.status_code == 304 and cached:
+                rprint(f"[green]Registry unchanged ({len(cached.get('servers', {}))} servers)[/green]")
+                self._touch_local_registry()  # Restart the freshness window
+                return cached
+
             response.raise_for_status()
-            data = response.json()
+            # Parse the raw body; no need to decode it to text first
+            data = _loads(response.content)
             rprint(f"[green]Successfully fetched registry with {len(data.get('servers', {}))} servers[/green]")
+            for key, header in (('etag', 'ETag'), ('last_modified', 'Last-Modified')):
+                if response.headers.get(header):
+                    data[key] = response.headers[header]
             self._save_local_registry(data)
             return data
         except Exception as e:
             rprint(f"[red]Error updating registry: {str(e)}[/red]")
-            return self._load_local_registry() or {'servers': {}}
+            return cached or {'servers': {}}
 
-    def get_available_servers(self) -> List[Dict]:
-        """Get list of available servers from the registry."""
+    def _registry_servers(self) -> Dict[str, Dict]:
+        """The registry's servers by name, from the local copy or a fresh fetch if it has expired."""
         data = self._load_local_registry()
         if not data:
             data = self.update_registry()
-        return list(data.get('servers', {}).values())
+        return data.get('servers', {})
+
+    def get_available_servers(self) -> List[Dict]:
+        """Get list of available servers from the registry."""
+        return list(self._registry_servers().values())
 
     def get_server_info(self, server_name: str) -> Optional[Dict]:
         """Get information about a specific server."""
-        data = self._load_local_registry()
-        if not data:
-            data = self.update_registry()
-        return data.get('servers', {}).get(server_name)
+        return self._registry_servers().get(server_name)
 
     def install_server(self, server_name: str) -> bool:
         """Install a server from the registry."""
-        server_info = self.get_server_info(server_name)
-        if not server_info:
-            rprint(f"[red]Error: Server '{server_name}' not found in registry[/red]")
-            return False
+        return self.install_servers([server_name])
+
+    def install_servers(self, server_names: List[str]) -> bool:
+        """Install servers from the registry with a single npm run; True if every one was installed."""
+        # (name, registry info, required env, provided env) for each server that gets installed
+        pending = []
+        all_ok = True
 
         try:
-            # Collect environment variables and placeholder values
-            env_vars = {}
-            
-            # Check if server requires environment variables
-            if "env" in server_info and server_info["env"]:
-                rprint(f"[yellow]Server '{server_name}' requires the following environment variables:[/yellow]")
-                for var_name, description in server_info["env"].items():
-                    rprint(f"  [cyan]{var_name}[/cyan]: {description}")
-                
-                # Ask if user wants to provide values now
-                if self._confirm_with_prompt("Would you like to provide values for these environment variables now?"):
-                    for var_name, description in server_info["env"].items():
-                        value = self._prompt_for_value(var_name, description)
-                        if value:
-                            env_vars[var_name] = value
-                    
-                    if not env_vars:
-                        # If no values were provided, confirm if user wants to proceed
-                        if not self._confirm_installation():
-                            rprint(f"[yellow]Installation of '{server_name}' cancelled.[/yellow]")
-                            return False
-                else:
-                    # If user doesn't want to provide values now, confirm if they want to proceed
-                    if not self._confirm_installation():
-                        rprint(f"[yellow]Installation of '{server_name}' cancelled.[/yellow]")
-                        return False
-            
-            # Process args that contain placeholders in curly braces
-            if "args" in server_info:
-                modified_args = []
-                placeholders_found = False
-                
-                for arg in server_info["args"]:
-                    # Check if arg contains placeholders (text between curly braces)
-                    if isinstance(arg, str) and "{" in arg and "}" in arg:
-                        import re
-                        # Find all placeholders in this arg
-                        placeholders = re.findall(r'\{([^}]+)\}', arg)
-                        modified_arg = arg
-                        
-                        for placeholder in placeholders:
-                            # Skip the special {install_dir} placeholder
-                            if placeholder == "install_dir":
-                                # Will be replaced later
-                                continue
-                            
-                            placeholders_found = True
-                            # Prompt user for value
-                            rprint(f"[yellow]Argument requires a value for [cyan]{{{placeholder}}}[/cyan][/yellow]")
-                            value = self._prompt_for_value(placeholder)
-                            
-                            # Replace placeholder with value
-                            modified_arg = modified_arg.replace(f"{{{placeholder}}}", value)
-                        
-                        modified_args.append(modified_arg)
-                    else:
-                        modified_args.append(arg)
-                
-                # If placeholders were found, update args
-                if placeholders_found:
-                    # Replace {install_dir} with the actual path
-                    install_dir = self._get_install_dir(server_info['package_name'])
-                    for i, arg in enumerate(modified_args):
-                        if isinstance(arg, str):
-                            modified_args[i] = arg.replace("{install_dir}", install_dir)
-                    
-                    server_info["args"] = modified_args
-                    rprint("[green]Updated command arguments with your provided values.[/green]")
-
-            # Install the package using npm
-            package_name = server_info['package_name']
-            rprint(f"[yellow]Installing {package_name}...[/yellow]")
-            
+            # One registry load serves every name
+            registry_servers = self._registry_servers()
+
+            # Collect environment variables and placeholder values up front, so npm runs once
+            for server_name in dict.fromkeys(server_names):
+                server_info = registry_servers.get(server_name)
+                if not server_info:
+                    rprint(f"[red]Error: Server '{server_name}' not found in registry[/red]")
+                    all_ok = False
+                    continue
+
+                required_env = server_info.get("env") or {}
+                env_vars = self._collect_env_vars(server_name, required_env)
+                if env_vars is None:
+                    rprint(f"[yellow]Installation of '{server_name}' cancelled.[/yellow]")
+                    all_ok = False
+                    continue
+
+                if "args" in server_info:
+                    # Copy the entry rather than editing the cached registry
+                    server_info = dict(server_info, args=self._resolve_args(server_info))
+
+                pending.append((server_name, server_info, required_env, env_vars))
+
+            if not pending:
+                return False
+
+            # Install the packages using npm
+            package_names = list(dict.fromkeys(info['package_name'] for _, info, _, _ in pending))
+            rprint(f"[yellow]Installing {', '.join(package_names)}...[/yellow]")
+
+            npm_path = find_npm_path()
+            if not npm_path:
+                rprint("[red]Error: npm not found. Please install Node.js and npm.[/red]")
+                return False
+
+            # No shell in between (package names come from the remote registry), and npm's
+            # stdout is never read so don't buffer it
             result = subprocess.run(
-                f"npm install -g {package_name}",
-                shell=True,
-                capture_output=True,
+                [npm_path, 'install', '-g', *package_names],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=30
+                timeout=30 * len(package_names)
             )
-            
+
             if result.returncode != 0:
                 rprint(f"[red]Error installing server: {result.stderr}[/red]")
                 return False
 
-            # Add to Cursor's config
-            cursor_config_path = Path.home() / ".cursor" / "mcp.json"
-            try:
-                with open(cursor_config_path, 'r') as f:
-                    config = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                config = {"mcpServers": {}}
-
-            server_config = {
-                'command': server_info['command'],
-                'args': server_info['args'],
-                'description': server_info.get('description', '')
-            }
-            
-            # Add environment variables if provided
-            if env_vars:
-                server_config['env'] = env_vars
-                
-            config['mcpServers'][server_name] = server_config
+            server_configs = {}
+            for server_name, server_info, _, env_vars in pending:
+                server_config = {
+                    'command': server_info['command'],
+                    'args': server_info['args'],
+                    'description': server_info.get('description', '')
+                }
 
-            with open(cursor_config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+                # Add environment variables if provided
+                if env_vars:
+                    server_config['env'] = env_vars
+                server_configs[server_name] = server_config
 
-            # Remind user about required environment variables that weren't provided
-            if "env" in server_info and server_info["env"]:
-                missing_vars = [var for var in server_info["env"] if var not in env_vars]
-                if missing_vars:
-                    rprint(f"[yellow]IMPORTANT: Before using '{server_name}', make sure to set these environment variables:[/yellow]")
-                    for var_name in missing_vars:
-                        rprint(f"  [cyan]{var_name}[/cyan]: {server_info['env'][var_name]}")
+            self._write_cursor_config(server_configs)
 
-            rprint(f"[green]Successfully installed '{server_name}'[/green]")
-            return True
+            for server_name, _, required_env, env_vars in pending:
+                self._remind_missing_env(server_name, required_env, env_vars)
+                rprint(f"[green]Successfully installed '{server_name}'[/green]")
+            return all_ok
 
         except Exception as e:
             rprint(f"[red]Error installing server: {str(e)}[/red]")
             return False
 
+    def _collect_env_vars(self, server_name: str, required_env: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """Offer to fill in a server's required environment variables; None means the user cancelled."""
+        env_vars = {}
+        if not required_env:
+            return env_vars
+
+        rprint(f"[yellow]Server '{server_name}' requires the following environment variables:[/yellow]")
+        for var_name, description in required_env.items():
+            rprint(f"  [cyan]{var_name}[/cyan]: {description}")
+        
+        # Ask if user wants to provide values now
+        if self._confirm_with_prompt("Would you like to provide values for these environment variables now?"):
+            for var_name, description in required_env.items():
+                value = self._prompt_for_value(var_name, description)
+                if value:
+                    env_vars[var_name] = value
+
+        # Without any values, confirm if user wants to proceed anyway
+        if not env_vars and not self._confirm_installation():
+            return None
+        return env_vars
+
+    def _resolve_args(self, server_info: Dict) -> List:
+        """Fill in the {placeholders} in a server's args, prompting for everything but {install_dir}."""
+        args = server_info["args"]
+
+        # Every placeholder across all args in first-seen order, so each is asked for once
+        placeholders = dict.fromkeys(
+            placeholder
+            for arg in args if isinstance(arg, str)
+            for placeholder in _VAR_PATTERN.findall(arg)
+        )
+        if not placeholders:
+            return args
+
+        arg_values = {}
+        for placeholder in placeholders:
+            if placeholder == "install_dir":
+                # Resolved from npm rather than asked for
+                arg_values[placeholder] = self._get_install_dir(server_info['package_name'])
+                continue
+
+            # Prompt user for value
+            rprint(f"[yellow]Argument requires a value for [cyan]{{{placeholder}}}[/cyan][/yellow]")
+            arg_values[placeholder] = self._prompt_for_value(placeholder)
+
+        if any(name != "install_dir" for name in arg_values):
+            rprint("[green]Updated command arguments with your provided values.[/green]")
+        return [_substitute(arg, arg_values) if isinstance(arg, str) else arg for arg in args]
+
+    def _write_cursor_config(self, server_configs: Dict[str, Dict]):
+        """Add or replace server entries in Cursor's MCP configuration, in one write."""
+        try:
+            config = load_json_cached(self.cursor_config_path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            config = {"mcpServers": {}}
+
+        # The loaded config is shared with the parse cache; replace mcpServers rather than editing it
+        config = dict(config, mcpServers={**config['mcpServers'], **server_configs})
+
+        self._ensure_config_dir()
+        write_json_atomic(self.cursor_config_path, config)
+
+    def _remind_missing_env(self, server_name: str, required_env: Dict[str, str], env_vars: Dict[str, str]):
+        """Remind the user about required environment variables that weren't provided."""
+        missing_vars = [var for var in required_env if var not in env_vars]
+        if missing_vars:
+            rprint(f"[yellow]IMPORTANT: Before using '{server_name}', make sure to set these environment variables:[/yellow]")
+            for var_name in missing_vars:
+                rprint(f"  [cyan]{var_name}[/cyan]: {required_env[var_name]}")
+
     def _confirm_installation(self) -> bool:
         """Ask user to confirm installation of server with environment variables."""
         try:
@@ -242,15 +460,9 @@ class ServerRegistry:
         """Get the installation directory for an npm package."""
         try:
             # Try to find the global npm installation directory
-            result = subprocess.run(
-                "npm root -g",
-                shell=True,
-                capture_output=True,
-                text=True
-            )
+            npm_root = find_npm_root()
             
-            if result.returncode == 0:
-                npm_root = result.stdout.strip()
+            if npm_root:
                 # The package directory would be inside this root
                 package_name_clean = package_name.split('/')[-1].replace('@', '')
                 return str(Path(npm_root) / package_name_clean)
@@ -0,0 +1,138 @@
+import json
+import os
+import stat
+
+import pytest
+from click.testing import CliRunner
+
+import mcp_manager
+import server_registry
+from server_registry import load_json_cached, write_json_atomic
+
+
+def _write_config(home, servers):
+    cursor_dir = home / ".cursor"
+    cursor_dir.mkdir()
+    (cursor_dir / "mcp.json").write_text(json.dumps({"mcpServers": servers}))
+
+
+def _isolate(home, monkeypatch):
+    """Point ~ (and with it ~/.cursor) at a scratch directory."""
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setattr(mcp_manager, "PID_CACHE_PATH", str(home / "pids.json"))
+
+
+def test_load_json_cached_reparses_when_mtime_or_size_changes(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('{"a": 1}')
+    first = load_json_cached(path)
+    assert load_json_cached(path) is first  # Unchanged file: served from the cache
+
+    path.write_text('{"a": 22}')  # New size
+    assert load_json_cached(path) == {"a": 22}
+
+    path.write_text('{"a": 33}')  # Same size, so only the mtime tells them apart
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000))
+    assert load_json_cached(path) == {"a": 33}
+
+
+def test_write_json_atomic_skips_unchanged_content(tmp_path):
+    path = tmp_path / "data.json"
+    assert write_json_atomic(path, {"a": 1}) is True
+    st = path.stat()
+    content = path.read_bytes()
+
+    assert write_json_atomic(path, {"a": 1}) is False
+    server_registry._JSON_CACHE.clear()  # Also when only the on-disk bytes can be compared
+    assert write_json_atomic(path, {"a": 1}) is False
+
+    assert path.stat().st_mtime_ns == st.st_mtime_ns
+    assert path.stat().st_ino == st.st_ino
+    assert path.read_bytes() == content
+
+
+def test_write_json_atomic_keeps_file_mode(tmp_path):
+    path = tmp_path / "mcp.json"
+    path.write_text("{}")
+    path.chmod(0o600)
+
+    assert write_json_atomic(path, {"mcpServers": {}}) is True
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    path.chmod(0o644)
+    assert write_json_atomic(path, {"mcpServers": {"a": {}}}) is True
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_write_json_atomic_writes_through_symlink(tmp_path):
+    target = tmp_path / "dotfiles" / "mcp.json"
+    target.parent.mkdir()
+    target.write_text("{}")
+    link = tmp_path / "mcp.json"
+    link.symlink_to(target)
+
+    assert write_json_atomic(link, {"a": 1}) is True
+    assert link.is_symlink()
+    assert json.loads(target.read_text()) == {"a": 1}
+
+
+def test_write_json_atomic_leaves_no_temp_file_on_failure(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    path.write_text('{"a": 1}')
+
+    with pytest.raises(TypeError):
+        write_json_atomic(path, {"a": object()})  # Fails to serialize
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        write_json_atomic(path, {"a": 2})  # Fails after the temp file is written
+
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+    assert json.loads(path.read_text()) == {"a": 1}
+
+
+def test_url_only_servers_do_not_break_commands(tmp_path, monkeypatch):
+    _isolate(tmp_path, monkeypatch)
+    _write_config(tmp_path, {"remote": {"url": "http://localhost:8000/sse"}})
+    registry = {"servers": {"fs": {"name": "fs", "description": "Filesystem access"}}}
+    (tmp_path / ".cursor" / "mcp_registry.json").write_text(json.dumps(registry))
+
+    result = CliRunner().invoke(mcp_manager.cli, ["available"])
+
+    assert result.exit_code == 0, result.output
+    assert "fs" in result.output
+
+
+def test_list_shows_configured_servers(tmp_path, monkeypatch):
+    _isolate(tmp_path, monkeypatch)
+    _write_config(tmp_path, {
+        "fs": {"command": "npx", "args": ["-y", "@modelcontextprotocol/server-filesystem", "/tmp"]},
+    })
+
+    result = CliRunner().invoke(mcp_manager.cli, ["list"])
+
+    assert result.exit_code == 0, result.output
+    assert "fs" in result.output
+    assert "Stopped" in result.output
+
+
+def test_install_and_uninstall_accept_several_names(tmp_path, monkeypatch):
+    _isolate(tmp_path, monkeypatch)
+    _write_config(tmp_path, {})
+    calls = []
+    monkeypatch.setattr(mcp_manager.MCPServerManager, "install_many_from_registry",
+                        lambda self, names: calls.append(("install", names)))
+    monkeypatch.setattr(mcp_manager.MCPServerManager, "uninstall_servers",
+                        lambda self, names: calls.append(("uninstall", names)))
+
+    runner = CliRunner()
+    result = runner.invoke(mcp_manager.cli, ["install", "fs", "shell"])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(mcp_manager.cli, ["uninstall", "fs", "shell"], input="y\n")
+    assert result.exit_code == 0, result.output
+
+    assert calls == [("install", ["fs", "shell"]), ("uninstall", ["fs", "shell"])]